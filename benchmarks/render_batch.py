@@ -0,0 +1,73 @@
+"""
+Compare the time Game spends rendering a frame with batch_render on and off,
+on a real Tk canvas holding a given number of enemies.
+
+    python benchmarks/render_batch.py [--enemies 100 1000 5000] [--seconds 3]
+
+Run it from the repository root; it needs a display.
+"""
+import argparse
+import os
+import sys
+import time
+import tkinter as tk
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pylint: disable=wrong-import-position
+from turtle_adventure import RandomWalkEnemy, TurtleAdventureGame
+
+SCREEN_WIDTH = 800
+SCREEN_HEIGHT = 500
+
+
+class BenchmarkGame(TurtleAdventureGame): # pylint: disable=too-many-ancestors
+    """
+    A game that keeps running when the player is hit, so every frame renders
+    the same number of enemies
+    """
+
+    def game_over_lose(self) -> None:
+        pass
+
+
+def measure(root: tk.Tk, num_enemies: int, batch_render: bool, seconds: float) -> float:
+    """
+    Run a game with num_enemies random walkers for the given number of
+    seconds and return its average render time in seconds
+    """
+    game = BenchmarkGame(root, SCREEN_WIDTH, SCREEN_HEIGHT, seed=0)
+    game.batch_render = batch_render
+    for _ in range(num_enemies):
+        game.add_enemy(RandomWalkEnemy(game, 10, "red"))
+    game.start()
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        root.update()
+    render_time = game.render_time
+    game.stop()
+    game.destroy()
+    return render_time
+
+
+def main() -> None:
+    """
+    Print the render time for each number of enemies with and without
+    batching
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", maxsplit=1)[0])
+    parser.add_argument("--enemies", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--seconds", type=float, default=3)
+    args = parser.parse_args()
+    root = tk.Tk()
+    root.geometry(f"{SCREEN_WIDTH}x{SCREEN_HEIGHT}")
+    print(f"{'enemies':>8} {'batched':>12} {'unbatched':>12}")
+    for num_enemies in args.enemies:
+        batched = measure(root, num_enemies, True, args.seconds)
+        unbatched = measure(root, num_enemies, False, args.seconds)
+        print(f"{num_enemies:>8} {batched*1000:>9.2f} ms {unbatched*1000:>9.2f} ms")
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main()
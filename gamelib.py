@@ -2,8 +2,12 @@
 The gamelib module defines abstract classes necessary for implementing simple
 games based on tkinter's canvas.
 """
+import heapq
+import time
 import tkinter as tk
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator
 
 
 class GameElement(ABC):
@@ -78,21 +82,333 @@ class GameElement(ABC):
         """
 
 
-class Game(tk.Frame, ABC): # pylint: disable=too-many-ancestors
+class Scheduler:
     """
-    An abstract class to be implemented with a concrete game class that relies
-    on update/render loop
+    Keep callbacks scheduled on a game's own clock, which only advances when
+    the game loop ticks, so timers stay in step with the simulation.
     """
 
-    def __init__(self, parent, update_delay=33):
-        super().__init__(parent)
-        self.__canvas = tk.Canvas(self)
-        self.__canvas.pack(expand=True, fill="both")
-        self.pack(expand=True, fill="both")
-        self.__game_elements = []
-        self.__update_delay = update_delay
-        self.__started = False
-        self.init_game()
+    def __init__(self):
+        self.__time: int = 0
+        self.__next_id: int = 0
+        self.__queue: list[tuple[int, int]] = []
+        self.__timers: dict[int, tuple[int, Callable[..., Any], tuple]] = {}
+
+    @property
+    def time(self) -> int:
+        """
+        Get the current time of the clock in milliseconds
+        """
+        return self.__time
+
+    def schedule(self, delay: int, callback: Callable[..., Any], *args) -> int:
+        """
+        Call callback(*args) once the clock has advanced by delay
+        milliseconds, and return an id that can be used to cancel it
+        """
+        self.__next_id += 1
+        due = self.__time + delay
+        heapq.heappush(self.__queue, (due, self.__next_id))
+        self.__timers[self.__next_id] = (due, callback, args)
+        return self.__next_id
+
+    def cancel(self, timer_id: int) -> None:
+        """
+        Cancel a pending callback
+        """
+        self.__timers.pop(timer_id, None)
+
+    def clear(self) -> None:
+        """
+        Cancel all pending callbacks and rewind the clock
+        """
+        self.__time = 0
+        self.__queue.clear()
+        self.__timers.clear()
+
+    def cancel_owner(self, owner: object) -> None:
+        """
+        Cancel every pending callback that is a method of owner
+        """
+        for timer_id, (_, callback, _) in list(self.__timers.items()):
+            if getattr(callback, "__self__", None) is owner:
+                del self.__timers[timer_id]
+
+    def pending(self) -> list[tuple[int, Callable[..., Any], tuple]]:
+        """
+        Get the (due time, callback, args) of every pending callback, in the
+        order they were scheduled
+        """
+        return [self.__timers[timer_id] for timer_id in sorted(self.__timers)]
+
+    def restore(self, time: int, timers: list[tuple[int, Callable[..., Any], tuple]]) -> None:
+        """
+        Set the clock to time and replace all pending callbacks with timers,
+        given as returned by pending()
+        """
+        self.clear()
+        self.__time = time
+        for due, callback, args in timers:
+            self.schedule(due - time, callback, *args)
+
+    def advance(self, delta: int) -> None:
+        """
+        Advance the clock by delta milliseconds and run every callback that
+        has become due, in the order they are due
+        """
+        self.__time += delta
+        queue = self.__queue
+        while queue and queue[0][0] <= self.__time:
+            _, timer_id = heapq.heappop(queue)
+            timer = self.__timers.pop(timer_id, None)
+            if timer is not None:
+                timer[1](*timer[2])
+
+
+class BatchedCanvas(tk.Canvas):
+    """
+    A canvas that can collect the coords, itemconfigure and tag_raise calls
+    of a whole frame and send them to Tcl in a single call instead of one
+    call each.  Every other method of tk.Canvas (and update() at the end of
+    a batch) first sends the operations collected so far, so they always
+    run in order.
+    """
+
+    # Commands are passed as one list of already split commands, so Tcl does
+    # not have to parse a script and Python does not have to quote one.
+    _BATCH_PROC = "::gamelib_batch"
+
+    def __init__(self, master=None, **kw):
+        super().__init__(master, **kw)
+        self.__commands: list[tuple] = []
+        self.__depth: int = 0
+        # update() or update_idletasks() requested during a batch
+        self.__pending_update: Callable[[], None] | None = None
+        self.tk.eval(f"proc {self._BATCH_PROC} {{commands}} "
+                     "{foreach command $commands {{*}$command}}")
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """
+        Collect canvas operations until the end of the with block
+        """
+        self.__depth += 1
+        try:
+            yield
+        finally:
+            self.__depth -= 1
+            if not self.__depth:
+                self.flush()
+                pending, self.__pending_update = self.__pending_update, None
+                if pending is not None:
+                    pending()
+
+    def flush(self) -> None:
+        """
+        Send the collected canvas operations to Tcl
+        """
+        if self.__commands:
+            commands = tuple(self.__commands)
+            self.__commands.clear()
+            self.tk.call(self._BATCH_PROC, commands)
+
+    def coords(self, *args):
+        if self.__depth and len(args) > 1:
+            command = [self._w, "coords", args[0]]
+            for arg in args[1:]:
+                command.extend(arg if isinstance(arg, (tuple, list)) else (arg,))
+            self.__commands.append(tuple(command))
+            return None
+        self.flush()
+        return super().coords(*args)
+
+    def itemconfigure(self, tagOrId, cnf=None, **kw): # pylint: disable=invalid-name
+        if cnf is not None and not isinstance(cnf, dict):
+            # a query for a single option
+            self.flush()
+            return super().itemconfigure(tagOrId, cnf, **kw)
+        options = {**(cnf or {}), **kw}
+        if self.__depth and options and not any(callable(v) for v in options.values()):
+            command = [self._w, "itemconfigure", tagOrId]
+            for key, value in options.items():
+                if value is not None:
+                    command += ["-" + key.rstrip("_"), value]
+            self.__commands.append(tuple(command))
+            return None
+        self.flush()
+        return super().itemconfigure(tagOrId, cnf, **kw)
+
+    itemconfig = itemconfigure
+
+    def tag_raise(self, *args):
+        if self.__depth:
+            self.__commands.append((self._w, "raise", *args))
+            return
+        self.flush()
+        super().tag_raise(*args)
+
+    lift = tkraise = tag_raise
+
+    # Processing events in the middle of a batch would draw a half-updated
+    # frame (turtle's screen update calls update() while rendering), so
+    # it is put off until the batch has been sent.
+
+    def update(self):
+        if self.__depth:
+            # update() also does what update_idletasks() does
+            self.__pending_update = super().update
+            return
+        self.flush()
+        super().update()
+
+    def update_idletasks(self):
+        if self.__depth:
+            if self.__pending_update is None:
+                self.__pending_update = super().update_idletasks
+            return
+        self.flush()
+        super().update_idletasks()
+
+    # every other canvas operation runs after the operations collected so far
+
+    def _create(self, itemType, args, kw): # pylint: disable=invalid-name
+        self.flush()
+        return super()._create(itemType, args, kw)
+
+    def delete(self, *args):
+        self.flush()
+        super().delete(*args)
+
+    def move(self, *args):
+        self.flush()
+        super().move(*args)
+
+    def tag_lower(self, *args):
+        self.flush()
+        super().tag_lower(*args)
+
+    lower = tag_lower
+
+    def bbox(self, *args):
+        self.flush()
+        return super().bbox(*args)
+
+    def find(self, *args):
+        self.flush()
+        return super().find(*args)
+
+    def gettags(self, *args):
+        self.flush()
+        return super().gettags(*args)
+
+    def itemcget(self, tagOrId, option): # pylint: disable=invalid-name
+        self.flush()
+        return super().itemcget(tagOrId, option)
+
+    def type(self, tagOrId): # pylint: disable=invalid-name
+        self.flush()
+        return super().type(tagOrId)
+
+    def index(self, *args):
+        self.flush()
+        return super().index(*args)
+
+    def canvasx(self, *args):
+        self.flush()
+        return super().canvasx(*args)
+
+    def canvasy(self, *args):
+        self.flush()
+        return super().canvasy(*args)
+
+    def postscript(self, cnf={}, **kw): # pylint: disable=dangerous-default-value
+        self.flush()
+        return super().postscript(cnf, **kw)
+
+    # the addtag_* methods all go through addtag()
+
+    def addtag(self, *args):
+        self.flush()
+        super().addtag(*args)
+
+    def dtag(self, *args):
+        self.flush()
+        super().dtag(*args)
+
+    def scale(self, *args):
+        self.flush()
+        super().scale(*args)
+
+    def moveto(self, tagOrId, x="", y=""): # pylint: disable=invalid-name
+        self.flush()
+        super().moveto(tagOrId, x, y)
+
+    def insert(self, *args):
+        self.flush()
+        super().insert(*args)
+
+    def dchars(self, *args):
+        self.flush()
+        super().dchars(*args)
+
+    def icursor(self, *args):
+        self.flush()
+        super().icursor(*args)
+
+    def focus(self, *args):
+        self.flush()
+        return super().focus(*args)
+
+    def select_adjust(self, tagOrId, index): # pylint: disable=invalid-name
+        self.flush()
+        super().select_adjust(tagOrId, index)
+
+    def select_clear(self):
+        self.flush()
+        super().select_clear()
+
+    def select_from(self, tagOrId, index): # pylint: disable=invalid-name
+        self.flush()
+        super().select_from(tagOrId, index)
+
+    def select_item(self):
+        self.flush()
+        return super().select_item()
+
+    def select_to(self, tagOrId, index): # pylint: disable=invalid-name
+        self.flush()
+        super().select_to(tagOrId, index)
+
+    def scan_mark(self, x, y):
+        self.flush()
+        super().scan_mark(x, y)
+
+    def scan_dragto(self, x, y, gain=10):
+        self.flush()
+        super().scan_dragto(x, y, gain)
+
+    def tag_bind(self, tagOrId, sequence=None, func=None, add=None): # pylint: disable=invalid-name
+        self.flush()
+        return super().tag_bind(tagOrId, sequence, func, add)
+
+    def tag_unbind(self, tagOrId, sequence, funcid=None): # pylint: disable=invalid-name
+        self.flush()
+        super().tag_unbind(tagOrId, sequence, funcid)
+
+
+class GameLoop(ABC):
+    """
+    The part of a game that does not need Tk: the registry of game elements,
+    the game clock and the update tick.  Game drives it from Tk's event
+    loop; a game without a display can call tick() directly.
+    """
+
+    def __init__(self, update_delay: int = 33):
+        self.__game_elements: list[GameElement] = []
+        self.__deleted_elements: set[GameElement] = set()
+        self.__update_delay: int = update_delay
+        self.__started: bool = False
+        self.__scheduler: Scheduler = Scheduler()
 
     @abstractmethod
     def init_game(self) -> None:
@@ -117,21 +433,72 @@ class Game(tk.Frame, ABC): # pylint: disable=too-many-ancestors
         Add a GameElement object to the game
         """
         element.create()
+        self.__deleted_elements.discard(element)
         self.__game_elements.append(element)
 
     def delete_element(self, element: GameElement) -> None:
         """
-        Remove a GameElement object to the game
+        Remove a GameElement object from the game and cancel the callbacks it
+        has scheduled.  The element is skipped from now on and dropped from
+        the game loop at the next tick.
         """
         element.delete()
-        self.__game_elements.remove(element)
+        self.__scheduler.cancel_owner(element)
+        self.__deleted_elements.add(element)
+
+    def __purge_elements(self) -> None:
+        if self.__deleted_elements:
+            deleted = self.__deleted_elements
+            self.__game_elements = [e for e in self.__game_elements if e not in deleted]
+            deleted.clear()
 
     @property
-    def canvas(self) -> tk.Canvas:
+    def element_count(self) -> int:
         """
-        Get the canvas object of the game application
+        Get the number of elements in the game loop
         """
-        return self.__canvas
+        return len(self.__game_elements)
+
+    def reset(self) -> None:
+        """
+        Stop the game, delete all elements and pending callbacks, and
+        initialize the game again
+        """
+        self.stop()
+        for element in self.__game_elements:
+            if element not in self.__deleted_elements:
+                element.delete()
+        self.__game_elements = []
+        self.__deleted_elements.clear()
+        self.__scheduler.clear()
+        self.init_game()
+
+    @property
+    def update_delay(self) -> int:
+        """
+        Get the game time in milliseconds covered by one tick
+        """
+        return self.__update_delay
+
+    @property
+    def scheduler(self) -> Scheduler:
+        """
+        Get the scheduler running on the game's clock
+        """
+        return self.__scheduler
+
+    def schedule(self, delay: int, callback: Callable[..., Any], *args) -> int:
+        """
+        Call callback(*args) after delay milliseconds of game time.  Unlike
+        after(), the timer does not run while the game is stopped.
+        """
+        return self.__scheduler.schedule(delay, callback, *args)
+
+    def cancel(self, timer_id: int) -> None:
+        """
+        Cancel a callback registered with schedule()
+        """
+        self.__scheduler.cancel(timer_id)
 
     @property
     def is_started(self) -> bool:
@@ -144,9 +511,7 @@ class Game(tk.Frame, ABC): # pylint: disable=too-many-ancestors
         """
         Start the game
         """
-        if not self.__started:
-            self.__started = True
-            self.animate()
+        self.__started = True
 
     def stop(self) -> None:
         """
@@ -154,12 +519,157 @@ class Game(tk.Frame, ABC): # pylint: disable=too-many-ancestors
         """
         self.__started = False
 
-    def animate(self):
+    def tick(self) -> None:
+        """
+        Advance the game clock by one tick and update every element once
+        """
+        self.__purge_elements()
+        self.__scheduler.advance(self.__update_delay)
+        deleted = self.__deleted_elements
+        for element in self.__game_elements:
+            if element not in deleted:
+                element.update()
+        self.__purge_elements()
+
+    def render_elements(self) -> None:
         """
-        Update and render all game's elements
+        Render every element with its current state
         """
+        deleted = self.__deleted_elements
         for element in self.__game_elements:
-            element.update()
-            element.render()
-        if self.__started:
-            self.after(self.__update_delay, self.animate)
+            if element not in deleted:
+                element.render()
+
+
+class Game(GameLoop, tk.Frame): # pylint: disable=too-many-ancestors
+    """
+    An abstract class to be implemented with a concrete game class that relies
+    on update/render loop
+    """
+
+    # fastest fast-forward allowed by time_scale
+    MAX_TIME_SCALE = 32
+
+    def __init__(self, parent, update_delay=33, batch_render=True):
+        tk.Frame.__init__(self, parent)
+        GameLoop.__init__(self, update_delay)
+        self.__canvas = BatchedCanvas(self)
+        self.__canvas.pack(expand=True, fill="both")
+        self.pack(expand=True, fill="both")
+        self.__animate_id = None
+        self.__time_scale = 1
+        self.__achieved_speed = 1.0
+        self.__last_frame = None
+        self.__last_ticks = 0
+        self.__batch_render = batch_render
+        self.__render_time = 0.0
+        self.init_game()
+
+    @property
+    def canvas(self) -> BatchedCanvas:
+        """
+        Get the canvas object of the game application
+        """
+        return self.__canvas
+
+    @property
+    def time_scale(self) -> int:
+        """
+        Get or set how many updates are run for every rendered frame, which
+        fast-forwards the game by that factor
+        """
+        return self.__time_scale
+
+    @time_scale.setter
+    def time_scale(self, val: int) -> None:
+        if not 1 <= val <= self.MAX_TIME_SCALE:
+            raise ValueError(f"time scale must be between 1 and {self.MAX_TIME_SCALE}")
+        self.__time_scale = val
+
+    @property
+    def batch_render(self) -> bool:
+        """
+        Get or set whether the canvas operations of each frame are sent to
+        Tcl together in a single call
+        """
+        return self.__batch_render
+
+    @batch_render.setter
+    def batch_render(self, val: bool) -> None:
+        self.__batch_render = val
+
+    @property
+    def render_time(self) -> float:
+        """
+        Get the average time in seconds spent rendering a frame
+        """
+        return self.__render_time
+
+    @property
+    def achieved_speed(self) -> float:
+        """
+        Get the speed-up over real time the game is actually running at,
+        which is below time_scale when the CPU cannot keep up
+        """
+        return self.__achieved_speed
+
+    def start(self) -> None:
+        """
+        Start the game
+        """
+        if not self.is_started:
+            super().start()
+            self.__last_frame = None
+            self.animate()
+
+    def stop(self) -> None:
+        """
+        Stop the game
+        """
+        super().stop()
+        if self.__animate_id is not None:
+            self.after_cancel(self.__animate_id)
+            self.__animate_id = None
+
+    def animate(self):
+        """
+        Update all game's elements time_scale times, stopping early if the
+        game ends, then render the final state once
+        """
+        self.__animate_id = None
+        start = time.perf_counter()
+        ticks = 0
+        while ticks < self.__time_scale:
+            self.tick()
+            ticks += 1
+            if not self.is_started:
+                break
+        self.__render()
+        self.__measure_speed(start)
+        self.__last_ticks = ticks
+        if self.is_started:
+            delay = self.update_delay
+            if self.__time_scale > 1:
+                # when fast-forwarding, subtract the time spent on this frame
+                # to keep up; at normal speed the game waits a full delay
+                busy = int((time.perf_counter() - start)*1000)
+                delay = max(1, delay - busy)
+            self.__animate_id = self.after(delay, self.animate)
+
+    def __render(self) -> None:
+        start = time.perf_counter()
+        if self.__batch_render:
+            with self.__canvas.batch():
+                self.render_elements()
+        else:
+            self.render_elements()
+        # smooth over roughly the last ten frames
+        self.__render_time += (time.perf_counter() - start - self.__render_time)/10
+
+    def __measure_speed(self, start: float) -> None:
+        # game time covered by the previous frame over the real time it took
+        if self.__last_frame is not None and start > self.__last_frame:
+            speed = self.__last_ticks*self.update_delay/1000 / (start - self.__last_frame)
+            # smooth over roughly the last ten frames
+            self.__achieved_speed += (speed - self.__achieved_speed)/10
+        self.__last_frame = start
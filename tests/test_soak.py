@@ -0,0 +1,142 @@
+"""
+Soak checks: restart games many times and make sure elements, enemies,
+timers, canvas items, images and memory stay bounded.  Run with
+``python -m pytest tests`` from the repository root.
+"""
+import tkinter as tk
+import tracemalloc
+import pytest
+
+RESTARTS = 200
+# about 23 seconds of game time, past Truck-kun's first summon (5 s), its
+# later returns and the extra chasers (10 s and 20 s)
+TICKS_PER_RUN = 700
+
+
+def immortal(game_class):
+    """
+    Return a subclass of game_class whose player survives every hit, so
+    each run lasts long enough to reach the timed events of a level
+    """
+    class ImmortalGame(game_class): # pylint: disable=too-many-ancestors
+        """A game that keeps running when the player is hit"""
+
+        def game_over_lose(self) -> None:
+            pass
+
+    return ImmortalGame
+
+
+def play(game, ticks: int) -> None:
+    """
+    Tick a game until it ends or the number of ticks runs out
+    """
+    for _ in range(ticks):
+        if not game.is_started:
+            return
+        game.tick()
+
+
+def counts(game) -> tuple[int, ...]:
+    """
+    Get the numbers of elements, enemies, pending timers and canvas items
+    """
+    return (game.element_count, len(game.enemies), len(game.scheduler.pending()),
+            len(game.canvas.find_all()))
+
+
+def assert_bounded(samples: list[tuple[int, ...]], warmup: int) -> None:
+    """
+    Check that no count grows beyond what the first runs reached
+    """
+    for column in range(len(samples[0])):
+        assert max(s[column] for s in samples) <= max(s[column] for s in samples[:warmup])
+
+
+def test_headless_restarts_stay_bounded():
+    pytest.importorskip("numpy")
+    from turtle_env import HeadlessTurtleAdventureGame
+    game = immortal(HeadlessTurtleAdventureGame)(800, 500, level=5, seed=1)
+    fresh = counts(game)
+    # warm up caches (random buffers, enemy kinds) before measuring
+    for _ in range(10):
+        play(game, TICKS_PER_RUN)
+        game.reset()
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        samples = []
+        for _ in range(RESTARTS):
+            play(game, TICKS_PER_RUN)
+            samples.append(counts(game))
+            game.reset()
+            # a restart reclaims everything the last run created
+            assert counts(game) == fresh
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert_bounded(samples, 10)
+    assert current - baseline < 256*1024
+
+
+def test_headless_snapshot_restores_stay_bounded():
+    pytest.importorskip("numpy")
+    from turtle_env import HeadlessTurtleAdventureGame
+    game = immortal(HeadlessTurtleAdventureGame)(800, 500, level=5, seed=4)
+    play(game, TICKS_PER_RUN)
+    snapshot = game.snapshot()
+    expected = counts(game)
+    for _ in range(RESTARTS):
+        # deleting an enemy makes restore rebuild the whole enemy list
+        game.delete_element(game.enemies[0])
+        play(game, 50)
+        game.restore(snapshot)
+        play(game, 1)
+        game.restore(snapshot)
+        assert counts(game)[1:] == expected[1:]
+
+
+def test_headless_deleted_enemies_are_released():
+    pytest.importorskip("numpy")
+    from turtle_env import HeadlessTurtleAdventureGame
+    game = immortal(HeadlessTurtleAdventureGame)(800, 500, level=5, seed=2)
+    play(game, TICKS_PER_RUN)
+    deleted = list(game.enemies)
+    assert deleted
+    items = len(game.canvas.find_all())
+    for enemy in deleted:
+        game.delete_element(enemy)
+    game.tick()
+    assert not game.enemies
+    assert len(game.canvas.find_all()) < items
+    owners = [getattr(callback, "__self__", None)
+              for _, callback, _ in game.scheduler.pending()]
+    assert not any(owner is enemy for owner in owners for enemy in deleted)
+
+
+@pytest.fixture
+def root():
+    try:
+        window = tk.Tk()
+    except tk.TclError:
+        pytest.skip("no display")
+    yield window
+    window.destroy()
+
+
+@pytest.mark.parametrize("swarm", [False, True])
+def test_tk_restarts_stay_bounded(root, swarm):
+    if swarm:
+        pytest.importorskip("numpy")
+    from turtle_adventure import TurtleAdventureGame
+    game = immortal(TurtleAdventureGame)(root, 800, 500, level=5, swarm=swarm, seed=3)
+    samples = []
+    for _ in range(RESTARTS):
+        game.reset()
+        game.start()
+        play(game, TICKS_PER_RUN)
+        game.render_elements()
+        root.update()
+        samples.append(counts(game) + (len(root.tk.call("image", "names")),))
+    game.stop()
+    assert_bounded(samples, 10)
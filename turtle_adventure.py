@@ -2,15 +2,107 @@
 The turtle_adventure module maintains all classes related to the Turtle's
 adventure game.
 """
+import array
+import base64
 import random
+import struct
 import tkinter as tk
 import os
+import zlib
 from turtle import RawTurtle
-from gamelib import Game, GameElement
+from abc import abstractmethod
+from gamelib import Game, GameElement, GameLoop
+try:
+    import numpy as np
+except ImportError: # only the swarm layer needs NumPy
+    np = None
 
 # from PIL import Image, ImageTk
 
 
+class RandomSource:
+    """
+    Random numbers for one game.  Values are drawn from a seeded generator
+    in bulk and handed out from buffers, and the size of the canvas is
+    cached, so enemies never wait on Tk or on a generator call of their own.
+    """
+
+    # number of values drawn at once for each range
+    BUFFER_SIZE = 256
+
+    def __init__(self, width: int, height: int, seed: int | None = None):
+        self.__rng: random.Random = random.Random(seed)
+        self.__width: int = width
+        self.__height: int = height
+        self.__buffers: dict[tuple[int, int], list[int]] = {}
+
+    @property
+    def width(self) -> int:
+        """
+        Get the cached width of the canvas
+        """
+        return self.__width
+
+    @property
+    def height(self) -> int:
+        """
+        Get the cached height of the canvas
+        """
+        return self.__height
+
+    def resize(self, width: int, height: int) -> None:
+        """
+        Update the cached size of the canvas
+        """
+        if (width, height) != (self.__width, self.__height):
+            self.__width, self.__height = width, height
+            # buffered coordinates may be outside the new canvas
+            self.__buffers.clear()
+
+    def randint(self, low: int, high: int) -> int:
+        """
+        Return a random integer N such that low <= N <= high
+        """
+        buffer = self.__buffers.get((low, high))
+        if not buffer:
+            buffer = self.__rng.choices(range(low, high+1), k=self.BUFFER_SIZE)
+            self.__buffers[(low, high)] = buffer
+        return buffer.pop()
+
+    def random_x(self) -> int:
+        """
+        Return a random x coordinate on the canvas
+        """
+        return self.randint(0, self.__width)
+
+    def random_y(self) -> int:
+        """
+        Return a random y coordinate on the canvas
+        """
+        return self.randint(0, self.__height)
+
+    def choice(self, seq):
+        """
+        Return a random element of a non-empty sequence
+        """
+        return self.__rng.choice(seq)
+
+    def getstate(self) -> tuple:
+        """
+        Get the state of the generator, including buffered values
+        """
+        buffers = {key: array.array("l", buffer) for key, buffer in self.__buffers.items()}
+        return (self.__rng.getstate(), buffers, self.__width, self.__height)
+
+    def setstate(self, state: tuple) -> None:
+        """
+        Restore a state returned by getstate()
+        """
+        rng_state, buffers, self.__width, self.__height = state
+        self.__rng.setstate(rng_state)
+        self.__buffers = {key: list(buffer) for key, buffer in buffers.items()}
+
+
 class TurtleGameElement(GameElement):
     """
     An abstract class representing all game elemnets related to the Turtle's
@@ -136,6 +228,208 @@ class Home(TurtleGameElement):
         return x1 <= x <= x2 and y1 <= y <= y2
 
 
+class SpeedIndicator(TurtleGameElement):
+    """
+    Show the fast-forward speed in the top-left corner, along with the speed
+    actually achieved when the game cannot keep up.
+    """
+
+    def __init__(self, game: "TurtleAdventureGame"):
+        super().__init__(game)
+        self.__id: int
+        self.__text: str = ""
+
+    def create(self) -> None:
+        self.__id = self.canvas.create_text(10, 10, text="", anchor=tk.NW,
+                                            font=("Arial", 14, "bold"), fill="gray")
+
+    def delete(self) -> None:
+        self.canvas.delete(self.__id)
+
+    def update(self) -> None:
+        # the speed is measured by the game loop
+        pass
+
+    def render(self) -> None:
+        scale = self.game.time_scale
+        achieved = self.game.achieved_speed
+        if scale == 1:
+            text = ""
+        elif achieved < 0.9*scale:
+            text = f"{scale}x ({achieved:.1f}x)"
+        else:
+            text = f"{scale}x"
+        if text != self.__text:
+            self.__text = text
+            self.canvas.itemconfigure(self.__id, text=text)
+        if text:
+            # stay above enemies created after the indicator
+            self.canvas.tag_raise(self.__id)
+
+
+class SwarmLayer(TurtleGameElement):
+    """
+    Rasterize many small enemies into one bitmap shown as a single canvas
+    image item.  The layer keeps the positions of its members in flat arrays
+    and stamps every copy of a sprite into the bitmap with one NumPy
+    operation, so a frame costs a few array passes instead of one Tcl round
+    trip (or Python loop) per enemy.  It requires NumPy.
+    """
+
+    _PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+    # pylint: disable=too-many-instance-attributes
+    def __init__(self, game: "TurtleAdventureGame", width: int, height: int):
+        if np is None:
+            raise RuntimeError("SwarmLayer requires NumPy")
+        super().__init__(game)
+        self.__id: int
+        self.__img: tk.PhotoImage
+        self.__width: int = width
+        self.__height: int = height
+        # one slot per member; freed slots are reused and have no sprite
+        self.__xs: array.array = array.array("d")
+        self.__ys: array.array = array.array("d")
+        self.__sprite_ids: array.array = array.array("q")
+        self.__free_slots: list[int] = []
+        # (shape, size, color) -> sprite id; sprites are (offsets, size, pixel)
+        self.__sprite_keys: dict[tuple[str, int, str], int] = {}
+        self.__sprites: list[tuple[np.ndarray, np.ndarray, int, int]] = []
+        self.__pixels: np.ndarray = np.zeros((height, width), dtype="<u4")
+        # every PNG scanline starts with a filter byte (0) followed by RGBA
+        self.__scanlines: np.ndarray = np.zeros((height, 1 + 4*width), dtype=np.uint8)
+        self.__empty: bool = False
+
+    @property
+    def xs(self) -> array.array:
+        """
+        Get the x coordinates of the members, indexed by slot
+        """
+        return self.__xs
+
+    @property
+    def ys(self) -> array.array:
+        """
+        Get the y coordinates of the members, indexed by slot
+        """
+        return self.__ys
+
+    def create(self) -> None:
+        self.__img = tk.PhotoImage(master=self.canvas,
+                                   width=self.__width,
+                                   height=self.__height)
+        self.__id = self.canvas.create_image(0, 0, image=self.__img, anchor=tk.NW)
+
+    def delete(self) -> None:
+        # members still hold slots and take their positions back when they
+        # are deleted themselves
+        self.canvas.delete(self.__id)
+
+    def update(self) -> None:
+        # members are updated by the game loop as ordinary elements
+        pass
+
+    def render(self) -> None:
+        if len(self.__free_slots) == len(self.__sprite_ids):
+            if self.__empty:
+                return
+            self.__empty = True
+        else:
+            self.__empty = False
+        pixels = self.__pixels
+        pixels.fill(0)
+        self.__stamp(pixels)
+        self.__scanlines[:, 1:] = pixels.view(np.uint8).reshape(self.__height, -1)
+        self.__img.configure(data=base64.b64encode(self.__encode_png()), format="png")
+
+    def __stamp(self, pixels: np.ndarray) -> None:
+        """
+        Draw every member into the pixel buffer, one sprite at a time
+        """
+        height, width = pixels.shape
+        flat = pixels.reshape(-1)
+        # views of the arrays must not outlive this call, or the arrays
+        # could no longer grow
+        xs = np.frombuffer(self.__xs, dtype=np.float64)
+        ys = np.frombuffer(self.__ys, dtype=np.float64)
+        sprite_ids = np.frombuffer(self.__sprite_ids, dtype=np.int64)
+        for sprite_id in np.unique(sprite_ids[sprite_ids >= 0]):
+            rows, cols, size, pixel = self.__sprites[sprite_id]
+            slots = np.flatnonzero(sprite_ids == sprite_id)
+            # the enemy's box goes from -size/2 to +size around its position
+            lefts = np.floor(xs[slots] - size/2).astype(np.int64)
+            tops = np.floor(ys[slots] - size/2).astype(np.int64)
+            extent = size//2 + size
+            inside = (lefts >= 0) & (tops >= 0) & (lefts + extent <= width) \
+                & (tops + extent <= height)
+            corners = tops[inside]*width + lefts[inside]
+            flat[(corners[:, None] + (rows*width + cols)[None, :]).reshape(-1)] = pixel
+            if not inside.all():
+                edge_rows = tops[~inside, None] + rows[None, :]
+                edge_cols = lefts[~inside, None] + cols[None, :]
+                visible = (edge_rows >= 0) & (edge_rows < height) \
+                    & (edge_cols >= 0) & (edge_cols < width)
+                pixels[edge_rows[visible], edge_cols[visible]] = pixel
+
+    def add(self, shape: str, size: int, color: str, x: float, y: float) -> int:
+        """
+        Draw a member at (x, y) as an "oval" or a "rectangle" spanning the
+        same box an enemy's own canvas item would, and return its slot.
+        """
+        sprite_id = self.__sprite(shape, int(size), color)
+        if self.__free_slots:
+            slot = self.__free_slots.pop()
+            self.__xs[slot], self.__ys[slot] = x, y
+            self.__sprite_ids[slot] = sprite_id
+        else:
+            slot = len(self.__sprite_ids)
+            self.__xs.append(x)
+            self.__ys.append(y)
+            self.__sprite_ids.append(sprite_id)
+        return slot
+
+    def remove(self, slot: int) -> None:
+        """
+        Stop drawing the member in the slot.
+        """
+        self.__sprite_ids[slot] = -1
+        self.__free_slots.append(slot)
+
+    def __sprite(self, shape: str, size: int, color: str) -> int:
+        """
+        Return the id of the sprite of a shape, caching the rows and columns
+        of its pixels along with its color as a little-endian RGBA word.
+        """
+        key = (shape, size, color)
+        if key not in self.__sprite_keys:
+            red, green, blue = (c >> 8 for c in self.canvas.winfo_rgb(color))
+            pixel = red | green << 8 | blue << 16 | 255 << 24
+            extent = size//2 + size
+            rows, cols = np.mgrid[0:extent, 0:extent]
+            if shape == "oval":
+                radius = extent/2
+                mask = (rows + 0.5 - radius)**2 + (cols + 0.5 - radius)**2 <= radius*radius
+            else:
+                mask = np.ones((extent, extent), dtype=bool)
+            self.__sprite_keys[key] = len(self.__sprites)
+            self.__sprites.append((rows[mask], cols[mask], size, pixel))
+        return self.__sprite_keys[key]
+
+    def __encode_png(self) -> bytes:
+        """
+        Encode the scanlines as an RGBA PNG, which Tk reads with alpha so
+        the rest of the canvas shows through the empty pixels.
+        """
+        def chunk(kind: bytes, data: bytes) -> bytes:
+            crc = zlib.crc32(data, zlib.crc32(kind))
+            return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", crc)
+        header = struct.pack(">IIBBBBB", self.__width, self.__height, 8, 6, 0, 0, 0)
+        return (self._PNG_SIGNATURE
+                + chunk(b"IHDR", header)
+                + chunk(b"IDAT", zlib.compress(self.__scanlines, 1))
+                + chunk(b"IEND", b""))
+
+
 class Player(TurtleGameElement):
     """
     Represent the main player, implemented using Python's turtle.
@@ -150,13 +444,12 @@ class Player(TurtleGameElement):
         self.__turtle: RawTurtle = turtle
 
     def create(self) -> None:
-        turtle = RawTurtle(self.canvas)
+        turtle = self.__turtle
         turtle.getscreen().tracer(False) # disable turtle's built-in animation
         turtle.shape("turtle")
         turtle.color("green")
         turtle.penup()
-
-        self.__turtle = turtle
+        turtle.showturtle()
 
     @property
     def speed(self) -> float:
@@ -170,7 +463,8 @@ class Player(TurtleGameElement):
         self.__speed = val
 
     def delete(self) -> None:
-        pass
+        # the turtle belongs to the game and is reused when it restarts
+        self.__turtle.hideturtle()
 
     def update(self) -> None:
         # check if player has arrived home
@@ -188,6 +482,17 @@ class Player(TurtleGameElement):
         self.__turtle.goto(self.x, self.y)
         self.__turtle.getscreen().update()
 
+    @property
+    def heading(self) -> float:
+        """
+        Get or set the direction the player is facing
+        """
+        return self.__turtle.heading()
+
+    @heading.setter
+    def heading(self, val: float) -> None:
+        self.__turtle.setheading(val)
+
     # override original property x's getter/setter to use turtle's methods
     # instead
     @property
@@ -236,6 +541,30 @@ class Enemy(TurtleGameElement):
         """
         return self.__color
 
+    @property
+    def is_active(self) -> bool:
+        """
+        Get the flag indicating whether the enemy is currently on the field
+        and able to hit the player
+        """
+        return True
+
+    # number of values returned by get_state()
+    STATE_SIZE = 6
+
+    def get_state(self) -> tuple[float, ...]:
+        """
+        Get the enemy's state as STATE_SIZE numbers, starting with its
+        position.  Subclasses fill the rest with their own fields.
+        """
+        return (self.x, self.y, 0, 0, 0, 0)
+
+    def set_state(self, state) -> None:
+        """
+        Restore a state returned by get_state()
+        """
+        self.x, self.y = state[0], state[1]
+
     def hits_player(self):
         """
         Check whether the enemy is hitting the player
@@ -246,12 +575,76 @@ class Enemy(TurtleGameElement):
             (self.y - self.size/2 < self.game.player.y < self.y + self.size/2)
         )
 
+class SwarmEnemy(Enemy):
+    """
+    An enemy that can be drawn by the game's swarm layer.  While it is part
+    of the swarm, its position is kept in the layer's arrays.
+    """
+
+    def __init__(self,
+                 game: "TurtleAdventureGame",
+                 size: int,
+                 color: str):
+        super().__init__(game, size, color)
+        self.__layer: SwarmLayer | None = None
+        self.__slot: int = -1
+
+    @property
+    def in_swarm(self) -> bool:
+        """
+        Get the flag indicating whether the enemy is drawn by the swarm layer
+        """
+        return self.__layer is not None
+
+    def join_swarm(self, shape: str) -> None:
+        """
+        Have the game's swarm layer draw this enemy as the given shape
+        """
+        self.__layer = self.game.swarm_layer
+        self.__slot = self.__layer.add(shape, self.size, self.color,
+                                       GameElement.x.fget(self), GameElement.y.fget(self))
+
+    def leave_swarm(self) -> None:
+        """
+        Stop being drawn by the swarm layer, taking the position back
+        """
+        GameElement.x.fset(self, self.x)
+        GameElement.y.fset(self, self.y)
+        self.__layer.remove(self.__slot)
+        self.__layer = None
+
+    @property
+    def x(self) -> float:
+        if self.__layer is None:
+            return GameElement.x.fget(self)
+        return self.__layer.xs[self.__slot]
+
+    @x.setter
+    def x(self, val: float) -> None:
+        if self.__layer is None:
+            GameElement.x.fset(self, val)
+        else:
+            self.__layer.xs[self.__slot] = val
+
+    @property
+    def y(self) -> float:
+        if self.__layer is None:
+            return GameElement.y.fget(self)
+        return self.__layer.ys[self.__slot]
+
+    @y.setter
+    def y(self, val: float) -> None:
+        if self.__layer is None:
+            GameElement.y.fset(self, val)
+        else:
+            self.__layer.ys[self.__slot] = val
+
 # * Define your enemy classes
 # * Implement all methods required by the GameElement abstract class
 # * Define enemy's update logic in the update() method
 # * Check whether the player hits this enemy, then call the
 #   self.game.game_over_lose() method in the TurtleAdventureGame class.
-class RandomWalkEnemy(Enemy):
+class RandomWalkEnemy(SwarmEnemy):
     """
     Enemy that will walk randomly on the screen
     """
@@ -266,10 +659,13 @@ class RandomWalkEnemy(Enemy):
         self.y = self.random_y()
         self.__x_dest = self.random_x()
         self.__y_dest = self.random_y()
-        self.__spd = random.randint(1,3)
+        self.__spd = self.game.random.randint(1,3)
 
     def create(self) -> None:
         """creates the random walker"""
+        if self.game.swarm_layer is not None:
+            self.join_swarm("oval")
+            return
         self.__id = self.game.canvas.create_oval(0,
                                                  0,
                                                  self.size,
@@ -277,17 +673,17 @@ class RandomWalkEnemy(Enemy):
 
     def random_x(self):
         """random the coordinate on the x-axis that's in the canvas"""
-        return random.randint(0, self.canvas.winfo_width())
+        return self.game.random.random_x()
 
     def random_y(self):
         """random the coordinate on the y-axis that's in the canvas"""
-        return random.randint(0, self.canvas.winfo_height())
+        return self.game.random.random_y()
 
     def move_x(self):
         """move the random walker along the x-axis"""
-        if self.x in range(self.__x_dest-100, self.__x_dest+100):
+        if self.__x_dest-100 <= self.x < self.__x_dest+100:
             self.__x_dest = self.random_x()
-            self.__spd = random.randint(1,3)
+            self.__spd = self.game.random.randint(1,3)
         elif self.__x_dest > self.x:
             self.x += self.__spd
         else:
@@ -295,9 +691,9 @@ class RandomWalkEnemy(Enemy):
 
     def move_y(self):
         """move the random walker along the x-axis"""
-        if self.y in range(self.__y_dest-self.size, self.__y_dest+self.size):
+        if self.__y_dest-self.size <= self.y < self.__y_dest+self.size:
             self.__y_dest = self.random_y()
-            self.__spd = random.randint(1,3)
+            self.__spd = self.game.random.randint(1,3)
         elif self.__y_dest > self.y:
             self.y += self.__spd
         else:
@@ -312,6 +708,8 @@ class RandomWalkEnemy(Enemy):
 
     def render(self) -> None:
         """renders the random walker"""
+        if self.__id is None:
+            return
         self.game.canvas.coords(self.__id, self.x - self.size/2,
                                 self.y - self.size/2,
                                 self.x + self.size,
@@ -319,7 +717,18 @@ class RandomWalkEnemy(Enemy):
 
     def delete(self) -> None:
         """deletes the random walker"""
-        self.canvas.delete(self.__id)
+        if self.in_swarm:
+            self.leave_swarm()
+        elif self.__id is not None:
+            self.canvas.delete(self.__id)
+
+    def get_state(self) -> tuple[float, ...]:
+        """position, speed and destination of the random walker"""
+        return (self.x, self.y, self.__spd, self.__x_dest, self.__y_dest, 0)
+
+    def set_state(self, state) -> None:
+        """restores the random walker"""
+        self.x, self.y, self.__spd, self.__x_dest, self.__y_dest = state[:5]
 
 class ChasingEnemy(Enemy):
     """
@@ -331,17 +740,19 @@ class ChasingEnemy(Enemy):
         self.__img = None
         self.__img_obj = None
         self.__spd = 3
-        self.x = random.randint(int(self.canvas.winfo_width()*0.2),self.canvas.winfo_width()-100)
-        self.y = random.randint(int(self.canvas.winfo_width()*0.2),self.canvas.winfo_height()-100)
+        rand = self.game.random
+        self.x = rand.randint(int(rand.width*0.2),rand.width-100)
+        self.y = rand.randint(int(rand.width*0.2),rand.height-100)
         self.__x_spd = 0
         self.__y_spd = 0
+        self.__frame = 0
         self.__hide = False
 
     def create(self):
         """creates the chaser"""
-        ind = f"gif -index {random.randint(0,1)}"
         self.__hide = False
-        self.__img = tk.PhotoImage(file=os.path.join(os.getcwd(), 'chaser.gif'), format=ind)
+        self.__frame = self.game.random.randint(0,1)
+        self.__img = self.game.load_image('chaser.gif', self.__frame)
         self.__img_obj = self.canvas.create_image(self.x,self.y,
                                                   image=self.__img,
                                                   anchor=tk.CENTER)
@@ -352,10 +763,11 @@ class ChasingEnemy(Enemy):
             player_x, player_y = self.game.player.x, self.game.player.y
             delta_x, delta_y = player_x - self.x, player_y - self.y
             delta_c = (delta_x**2 + delta_y**2)**0.5
-            self.__x_spd = self.__spd * (delta_x/delta_c)
-            self.__y_spd = self.__spd * (delta_y/delta_c)
-            self.x += self.__x_spd
-            self.y += self.__y_spd
+            if delta_c > 0: # already on top of the player otherwise
+                self.__x_spd = self.__spd * (delta_x/delta_c)
+                self.__y_spd = self.__spd * (delta_y/delta_c)
+                self.x += self.__x_spd
+                self.y += self.__y_spd
             if self.hits_player():
                 self.game.game_over_lose()
 
@@ -366,10 +778,31 @@ class ChasingEnemy(Enemy):
     def delete(self):
         """deletes the chaser"""
         self.canvas.delete(self.__img_obj)
-        self.canvas.delete(self.__img)
         self.__hide = True
 
-class FencingEnemy(Enemy):
+    @property
+    def is_active(self) -> bool:
+        """a hidden chaser stays put until it is created again"""
+        return not self.__hide
+
+    def get_state(self) -> tuple[float, ...]:
+        """position, velocity, picture and visibility of the chaser"""
+        return (self.x, self.y, self.__x_spd, self.__y_spd, self.__frame, self.__hide)
+
+    def set_state(self, state) -> None:
+        """restores the chaser"""
+        self.x, self.y, self.__x_spd, self.__y_spd = state[:4]
+        hide = bool(state[5])
+        if hide and not self.__hide:
+            self.delete()
+        elif not hide and self.__hide:
+            self.create()
+        if int(state[4]) != self.__frame:
+            self.__frame = int(state[4])
+            self.__img = self.game.load_image('chaser.gif', self.__frame)
+            self.canvas.itemconfigure(self.__img_obj, image=self.__img)
+
+class FencingEnemy(SwarmEnemy):
     """Enemy that will walk around the home in a counter-clockwise square
     It will spawn on the "top" of the square area with random x coordinate.
     """
@@ -382,37 +815,40 @@ class FencingEnemy(Enemy):
         self.east = self.game.home.x + self.game.home.size + self.size + self.__spd
         self.north = self.game.home.y - self.game.home.size - self.size - self.__spd
         self.south = self.game.home.y + self.game.home.size + self.size + self.__spd
-        self.x = random.randint(self.west, self.east)
+        self.x = self.game.random.randint(self.west, self.east)
         self.y = self.north
 
     def create(self):
         """creates the fencer"""
+        if self.game.swarm_layer is not None:
+            self.join_swarm("rectangle")
+            return
         self.__id = self.canvas.create_rectangle(0,0,self.size,self.size, fill=self.color)
 
     def move_left(self):
         """move the fencer to the left until hitting the top-left corner"""
-        if self.x in range(self.west-self.size, self.west+self.size):
+        if self.west-self.size <= self.x < self.west+self.size:
             self.__move = self.move_down
         else:
             self.x -= self.__spd
 
     def move_down(self):
         """move the fencer down until hitting the bottom-left corner"""
-        if self.y in range(self.south-self.size, self.south+self.size):
+        if self.south-self.size <= self.y < self.south+self.size:
             self.__move = self.move_right
         else:
             self.y += self.__spd
 
     def move_right(self):
         """"move the fencer to the right until hitting the bottom-right corner"""
-        if self.x in range(self.east-self.size, self.east+self.size):
+        if self.east-self.size <= self.x < self.east+self.size:
             self.__move = self.move_up
         else:
             self.x += self.__spd
 
     def move_up(self):
         """move the fencer up until hitting the top-right corner"""
-        if self.y in range(self.north-self.size, self.north + self.size):
+        if self.north-self.size <= self.y < self.north + self.size:
             self.__move = self.move_left
         else:
             self.y -= self.__spd
@@ -425,6 +861,8 @@ class FencingEnemy(Enemy):
 
     def render(self):
         """render the fencer"""
+        if self.__id is None:
+            return
         self.game.canvas.coords(self.__id, self.x - self.size/2,
                                 self.y - self.size/2,
                                 self.x + self.size,
@@ -432,7 +870,22 @@ class FencingEnemy(Enemy):
 
     def delete(self):
         """deletes the fencer"""
-        self.canvas.delete(self.__id)
+        if self.in_swarm:
+            self.leave_swarm()
+        elif self.__id is not None:
+            self.canvas.delete(self.__id)
+
+    def __moves(self) -> list:
+        return [self.move_left, self.move_down, self.move_right, self.move_up]
+
+    def get_state(self) -> tuple[float, ...]:
+        """position, speed and current side of the square of the fencer"""
+        return (self.x, self.y, self.__spd, 0, 0, self.__moves().index(self.__move))
+
+    def set_state(self, state) -> None:
+        """restores the fencer"""
+        self.x, self.y, self.__spd = state[:3]
+        self.__move = self.__moves()[int(state[5])]
 
 class TruckKun(Enemy):
     """A Unique Enemy that will attempts to send our poor little turtle
@@ -445,20 +898,24 @@ class TruckKun(Enemy):
         self.__img_obj = None
         self.__is_animating = False
         self.__spd = -10
-        self.summon()
+        # the image is created when the game adds truck-kun
+        self.__spawn()
 
     def create(self):
         """Reads the image and creates truck-kun object"""
-        if self.__is_animating:
-            self.__img = tk.PhotoImage(file=os.path.join(os.getcwd(), 'truck_kun.gif'))
+        if self.__is_animating and self.__img_obj is None:
+            self.__img = self.game.load_image('truck_kun.gif')
             self.__img_obj = self.canvas.create_image(self.x,self.y,
                                                       image=self.__img, anchor=tk.CENTER)
 
-    def summon(self):
-        """Spawn Truck-kun on the turtle's current y-coords."""
+    def __spawn(self):
         self.__is_animating = True
-        self.x = self.game.winfo_width()+100
+        self.x = self.game.random.width+100
         self.y = self.game.player.y
+
+    def summon(self):
+        """Spawn Truck-kun on the turtle's current y-coords."""
+        self.__spawn()
         self.create()
 
     def move(self):
@@ -466,7 +923,7 @@ class TruckKun(Enemy):
         if self.x <= 0:
             self.__is_animating = False
             self.delete()
-            self.game.after(5000, self.summon)
+            self.game.schedule(5000, self.summon)
         else:
             self.x += self.__spd
 
@@ -485,17 +942,37 @@ class TruckKun(Enemy):
 
     def delete(self):
         """deletes truck-kun from the canvas"""
-        self.canvas.delete(self.__img_obj)
-        self.canvas.delete(self.__img)
+        if self.__img_obj is not None:
+            self.canvas.delete(self.__img_obj)
+            self.__img_obj = None
         self.__is_animating = False
 
+    @property
+    def is_active(self) -> bool:
+        """truck-kun is only dangerous while driving across the screen"""
+        return self.__is_animating
+
+    def get_state(self) -> tuple[float, ...]:
+        """position, speed and whether truck-kun is on its way"""
+        return (self.x, self.y, self.__spd, 0, 0, self.__is_animating)
+
+    def set_state(self, state) -> None:
+        """restores truck-kun"""
+        self.x, self.y, self.__spd = int(state[0]), state[1], int(state[2])
+        animating = bool(state[5])
+        if self.__is_animating and not animating:
+            self.delete()
+        elif animating and not self.__is_animating:
+            self.__is_animating = True
+            self.create()
+
 
 # Complete the EnemyGenerator class by inserting code to generate enemies
 # based on the given game level; call TurtleAdventureGame's add_enemy() method
 # to add enemies to the game at certain points in time.
 #
-# Hint: the 'game' parameter is a tkinter's frame, so it's after()
-# method can be used to schedule some future events.
+# Hint: the game's schedule() method can be used to schedule some future
+# events on the game's clock.
 
 class EnemyGenerator:
     """
@@ -508,10 +985,10 @@ class EnemyGenerator:
         self.__level: int = level
 
         # example
-        self.__game.after(100, self.create_basic_enemy)
-        self.__game.after(5000, self.summon_truck_kun)
-        self.__game.after(10000, self.create_chaser, 1)
-        self.__game.after(20000, self.create_chaser, 1)
+        self.__game.schedule(100, self.create_basic_enemy)
+        self.__game.schedule(5000, self.summon_truck_kun)
+        self.__game.schedule(10000, self.create_chaser, 1)
+        self.__game.schedule(20000, self.create_chaser, 1)
 
     @property
     def game(self) -> "TurtleAdventureGame":
@@ -536,7 +1013,7 @@ class EnemyGenerator:
     def create_random_walker(self, n) -> None:
         """Create random walkers"""
         for _ in range(n):
-            color = random.choice(['purple', 'cyan', 'blue',
+            color = self.game.random.choice(['purple', 'cyan', 'blue',
                                    'limegreen', 'yellow', 'orange', 'red'])
             new_enemy = RandomWalkEnemy(self.game, 20, color)
             self.game.add_enemy(new_enemy)
@@ -558,36 +1035,144 @@ class EnemyGenerator:
         truck = TruckKun(self.game, 100, "red")
         self.game.add_enemy(truck)
 
-class TurtleAdventureGame(Game): # pylint: disable=too-many-ancestors
+class GameSnapshot:
     """
-    The main class for Turtle's Adventure.
+    The complete state of a running game kept in flat arrays: the player and
+    waypoint, every enemy, the pending timers and the random generator.
+    A snapshot holds no reference to Tk objects and can be restored into the
+    game it was taken from any number of times.
     """
 
+    ENEMY_KINDS: tuple[type[Enemy], ...] = (RandomWalkEnemy, ChasingEnemy,
+                                            FencingEnemy, TruckKun)
+
     # pylint: disable=too-many-instance-attributes
-    def __init__(self, parent, screen_width: int, screen_height: int, level: int = 1):
+    def __init__(self, game: "TurtleAdventure"):
+        player, waypoint = game.player, game.waypoint
+        enemies = game.enemies
+        palette: dict[str, int] = {}
+        self.time: int = game.scheduler.time
+        self.player = array.array("d", (player.x, player.y, player.heading,
+                                        waypoint.is_active, waypoint.x, waypoint.y))
+        self.kinds = array.array("b", (self.ENEMY_KINDS.index(type(e)) for e in enemies))
+        self.sizes = array.array("d", (e.size for e in enemies))
+        self.colors = array.array("B", (palette.setdefault(e.color, len(palette))
+                                        for e in enemies))
+        self.palette: tuple[str, ...] = tuple(palette)
+        self.states = array.array("d")
+        for enemy in enemies:
+            self.states.extend(enemy.get_state())
+        owners = {id(game.enemy_generator): -1}
+        owners.update((id(e), i) for i, e in enumerate(enemies))
+        timers = game.scheduler.pending()
+        self.timer_due = array.array("q", (due for due, _, _ in timers))
+        self.timer_owners = array.array("l", (self.__owner(owners, cb) for _, cb, _ in timers))
+        self.timer_names: tuple[str, ...] = tuple(cb.__name__ for _, cb, _ in timers)
+        self.timer_args: tuple[tuple, ...] = tuple(args for _, _, args in timers)
+        self.random_state: tuple = game.random.getstate()
+
+    @staticmethod
+    def __owner(owners: dict[int, int], callback) -> int:
+        """
+        Get the index of the enemy (or -1 for the enemy generator) that a
+        pending callback is a method of
+        """
+        owner = owners.get(id(getattr(callback, "__self__", None)))
+        if owner is None:
+            raise ValueError(f"cannot capture timer {callback!r}: only methods of "
+                             "the enemy generator or of an enemy can be snapshotted")
+        return owner
+
+    def restore(self, game: "TurtleAdventure") -> None:
+        """
+        Put the game back into the captured state.  Enemies are updated in
+        place when the game still has the same enemies as the snapshot, and
+        recreated otherwise.
+        """
+        size = Enemy.STATE_SIZE
+        enemies = game.enemies
+        kinds = self.ENEMY_KINDS
+        same = (len(enemies) == len(self.kinds)
+                and all(type(e) is kinds[k] and e.size == s and e.color == self.palette[c]
+                        for e, k, s, c in zip(enemies, self.kinds, self.sizes, self.colors)))
+        if not same:
+            # deleting an enemy drops it from the list being iterated
+            for enemy in list(enemies):
+                game.delete_element(enemy)
+            for kind, enemy_size, color in zip(self.kinds, self.sizes, self.colors):
+                game.add_enemy(kinds[kind](game, int(enemy_size), self.palette[color]))
+        states = self.states
+        for i, enemy in enumerate(enemies):
+            enemy.set_state(states[i*size:(i+1)*size])
+
+        x, y, heading, active, waypoint_x, waypoint_y = self.player
+        game.player.x, game.player.y, game.player.heading = x, y, heading
+        if active:
+            game.waypoint.activate(waypoint_x, waypoint_y)
+        else:
+            game.waypoint.deactivate()
+            game.waypoint.x, game.waypoint.y = waypoint_x, waypoint_y
+
+        owners = [game.enemy_generator] + enemies
+        game.scheduler.restore(self.time, [
+            (due, getattr(owners[owner + 1], name), args)
+            for due, owner, name, args in zip(self.timer_due, self.timer_owners,
+                                              self.timer_names, self.timer_args)])
+        game.random.setstate(self.random_state)
+
+
+class TurtleAdventure(GameLoop):
+    """
+    The parts of Turtle's Adventure that do not depend on Tk: the elements
+    of a level, the list of enemies and snapshots.  It is shared by the game
+    shown on screen and the headless game used by bots.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+    def __init__(self, screen_width: int, screen_height: int, level: int = 1,
+                 seed: int | None = None):
+        # only sets attributes; the game loop is initialized by the subclass
         self.level: int = level
         self.screen_width: int = screen_width
         self.screen_height: int = screen_height
+        self.random: RandomSource = RandomSource(screen_width, screen_height, seed)
         self.waypoint: Waypoint
         self.player: Player
         self.home: Home
+        self.swarm_layer: SwarmLayer | None = None
         self.enemies: list[Enemy] = []
         self.enemy_generator: EnemyGenerator
-        super().__init__(parent)
 
-    def init_game(self):
-        self.canvas.config(width=self.screen_width, height=self.screen_height)
-        turtle = RawTurtle(self.canvas)
-        # set turtle screen's origin to the top-left corner
-        turtle.screen.setworldcoordinates(0, self.screen_height-1, self.screen_width-1, 0)
+    @abstractmethod
+    def create_player(self) -> Player:
+        """
+        Create the player element for a new level
+        """
+
+    @abstractmethod
+    def load_image(self, filename: str, index: int | None = None) -> tk.PhotoImage | None:
+        """
+        Load an image (or one frame of an animated GIF) for an element
+        """
 
+    def create_swarm_layer(self) -> SwarmLayer | None:
+        """
+        Create the layer drawing random walkers and fencers, or return None
+        to have each enemy draw its own canvas items
+        """
+        return None
+
+    def init_game(self) -> None:
+        self.enemies.clear()
         self.waypoint = Waypoint(self)
         self.add_element(self.waypoint)
         self.home = Home(self, (self.screen_width-100, self.screen_height//2), 20)
         self.add_element(self.home)
-        self.player = Player(self, turtle)
+        self.swarm_layer = self.create_swarm_layer()
+        if self.swarm_layer is not None:
+            self.add_element(self.swarm_layer)
+        self.player = self.create_player()
         self.add_element(self.player)
-        self.canvas.bind("<Button-1>", lambda e: self.waypoint.activate(e.x, e.y))
 
         self.enemy_generator = EnemyGenerator(self, level=self.level)
 
@@ -601,26 +1186,136 @@ class TurtleAdventureGame(Game): # pylint: disable=too-many-ancestors
         self.enemies.append(enemy)
         self.add_element(enemy)
 
-    def game_over_win(self) -> None:
+    def delete_element(self, element: GameElement) -> None:
         """
-        Called when the player wins the game and stop the game
+        Remove a GameElement object from the game.  An enemy is dropped from
+        the list of enemies as well.
+        """
+        super().delete_element(element)
+        if isinstance(element, Enemy) and element in self.enemies:
+            self.enemies.remove(element)
+
+    def snapshot(self) -> GameSnapshot:
+        """
+        Capture the current state of the game.  Every pending timer must be
+        a method of the enemy generator or of an enemy; ValueError is raised
+        for any other callback.
+        """
+        return GameSnapshot(self)
+
+    def restore(self, snapshot: GameSnapshot) -> None:
+        """
+        Return to a captured state
+        """
+        snapshot.restore(self)
+
+
+class TurtleAdventureGame(TurtleAdventure, Game): # pylint: disable=too-many-ancestors
+    """
+    The main class for Turtle's Adventure.
+    """
+
+    def __init__(self, parent, screen_width: int, screen_height: int, level: int = 1,
+                 swarm: bool = False, seed: int | None = None):
+        TurtleAdventure.__init__(self, screen_width, screen_height, level, seed)
+        self.swarm: bool = swarm
+        self.__images: dict[tuple[str, int | None], tk.PhotoImage] = {}
+        self.__turtle: RawTurtle | None = None
+        self.__game_over: bool = False
+        Game.__init__(self, parent)
+
+    def init_game(self):
+        if self.__turtle is None:
+            self.canvas.config(width=self.screen_width, height=self.screen_height)
+            self.__turtle = RawTurtle(self.canvas)
+            # set turtle screen's origin to the top-left corner
+            self.__turtle.screen.setworldcoordinates(0, self.screen_height-1,
+                                                     self.screen_width-1, 0)
+            # bound once; the handler looks up the current waypoint
+            self.canvas.bind("<Button-1>", lambda e: self.waypoint.activate(e.x, e.y))
+            self.canvas.bind("<Configure>", lambda e: self.random.resize(e.width, e.height))
+            # "+" and "-" double or halve the fast-forward speed
+            toplevel = self.winfo_toplevel()
+            for key in ("<Key-plus>", "<Key-equal>"):
+                toplevel.bind(key, lambda e: self.change_time_scale(2))
+            toplevel.bind("<Key-minus>", lambda e: self.change_time_scale(0.5))
+        super().init_game()
+        self.add_element(SpeedIndicator(self))
+
+    def create_swarm_layer(self) -> SwarmLayer | None:
+        if not self.swarm:
+            return None
+        # random walkers and fencers are drawn here instead of as items
+        return SwarmLayer(self, self.screen_width, self.screen_height)
+
+    def create_player(self) -> Player:
+        return Player(self, self.__turtle)
+
+    def change_time_scale(self, factor: float) -> None:
+        """
+        Multiply the fast-forward speed by factor, keeping it within the
+        allowed range
+        """
+        self.time_scale = max(1, min(self.MAX_TIME_SCALE, int(self.time_scale*factor)))
+
+    def reset(self) -> None:
+        """
+        Restart the game from the beginning.  Call start() to run it again.
+        """
+        self.__clear_game_over()
+        super().reset()
+
+    def load_image(self, filename: str, index: int | None = None) -> tk.PhotoImage:
+        """
+        Load an image (or one frame of an animated GIF) from the working
+        directory.  Images are shared by every element that asks for them.
+        """
+        key = (filename, index)
+        if key not in self.__images:
+            options = {} if index is None else {"format": f"gif -index {index}"}
+            self.__images[key] = tk.PhotoImage(file=os.path.join(os.getcwd(), filename),
+                                               **options)
+        return self.__images[key]
+
+    def restore(self, snapshot: GameSnapshot) -> None:
+        """
+        Return to a captured state.  A finished game has its result cleared
+        and has to be started again.
+        """
+        self.__clear_game_over()
+        super().restore(snapshot)
+        for element in (self.waypoint, self.player, *self.enemies):
+            element.render()
+
+    def __show_game_over(self, text: str, color: str) -> None:
+        """
+        Stop the game and show the result.  Only the first result of a game
+        is shown, however many times the game ends in the same frame.
         """
         self.stop()
+        if self.__game_over:
+            return
+        self.__game_over = True
         font = ("Arial", 36, "bold")
         self.canvas.create_text(self.screen_width/2,
                                 self.screen_height/2,
-                                text="You Win",
+                                text=text,
                                 font=font,
-                                fill="green")
+                                fill=color,
+                                tags="game_over")
+
+    def __clear_game_over(self) -> None:
+        self.canvas.delete("game_over")
+        self.__game_over = False
+
+    def game_over_win(self) -> None:
+        """
+        Called when the player wins the game and stop the game
+        """
+        self.__show_game_over("You Win", "green")
 
     def game_over_lose(self) -> None:
         """
         Called when the player loses the game and stop the game
         """
-        self.stop()
-        font = ("Arial", 36, "bold")
-        self.canvas.create_text(self.screen_width/2,
-                                self.screen_height/2,
-                                text="You Lose",
-                                font=font,
-                                fill="red")
+        self.__show_game_over("You Lose", "red")
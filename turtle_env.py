@@ -0,0 +1,369 @@
+"""
+The turtle_env module runs Turtle's Adventure without Tk so that bot pilots
+can be trained and evaluated on many games at once.  It requires NumPy.
+"""
+import math
+import multiprocessing as mp
+import random
+from typing import Any
+import numpy as np
+from gamelib import GameLoop
+from turtle_adventure import GameSnapshot, Player, TurtleAdventure
+
+
+class HeadlessCanvas:
+    """
+    Stand in for the canvas of a game that is never displayed.  Items only
+    get an id, which is kept until the item is deleted; all drawing
+    requests are ignored.
+    """
+
+    def __init__(self):
+        self.__next_id: int = 0
+        self.__items: set[int] = set()
+
+    def __create(self, *_args, **_kwargs) -> int:
+        self.__next_id += 1
+        self.__items.add(self.__next_id)
+        return self.__next_id
+
+    create_line = create_oval = create_rectangle = create_image = create_text = __create
+
+    def coords(self, *_args) -> None:
+        """Ignore a request to move an item"""
+
+    def itemconfigure(self, *_args, **_kwargs) -> None:
+        """Ignore a request to configure an item"""
+
+    def tag_raise(self, *_args) -> None:
+        """Ignore a request to raise an item"""
+
+    def delete(self, *items) -> None:
+        """Forget the given items"""
+        for item in items:
+            self.__items.discard(item)
+
+    def find_all(self) -> tuple[int, ...]:
+        """Get the ids of all items that have not been deleted"""
+        return tuple(sorted(self.__items))
+
+
+class HeadlessPlayer(Player):
+    """
+    Player whose position is kept in plain attributes instead of a turtle.
+    It walks in a straight line to the waypoint, like the turtle does.
+    """
+
+    def __init__(self, game: "HeadlessTurtleAdventureGame", speed: float = 5):
+        super().__init__(game, None, speed)
+        self.__x: float = 0
+        self.__y: float = 0
+        self.__heading: float = 0
+
+    def create(self) -> None:
+        pass
+
+    def delete(self) -> None:
+        pass
+
+    def update(self) -> None:
+        if self.game.home.contains(self.x, self.y):
+            self.game.game_over_win()
+        waypoint = self.game.waypoint
+        if waypoint.is_active:
+            delta_x, delta_y = waypoint.x - self.x, waypoint.y - self.y
+            distance = math.hypot(delta_x, delta_y)
+            if distance > 0:
+                # same as turtle.towards(): the game sets world coordinates
+                # with y pointing down, so no sign flip is needed
+                self.heading = math.degrees(math.atan2(delta_y, delta_x)) % 360
+                self.x += self.speed * delta_x/distance
+                self.y += self.speed * delta_y/distance
+            if math.hypot(waypoint.x - self.x, waypoint.y - self.y) < self.speed:
+                waypoint.deactivate()
+
+    def render(self) -> None:
+        pass
+
+    @property
+    def x(self) -> float:
+        return self.__x
+
+    @x.setter
+    def x(self, val: float) -> None:
+        self.__x = val
+
+    @property
+    def y(self) -> float:
+        return self.__y
+
+    @y.setter
+    def y(self, val: float) -> None:
+        self.__y = val
+
+    @property
+    def heading(self) -> float:
+        return self.__heading
+
+    @heading.setter
+    def heading(self, val: float) -> None:
+        self.__heading = val
+
+
+class HeadlessTurtleAdventureGame(TurtleAdventure):
+    """
+    A Turtle's Adventure game that is stepped explicitly with tick() instead
+    of by Tk.  It is started as soon as it is created.
+    """
+
+    def __init__(self, screen_width: int, screen_height: int, level: int = 1,
+                 update_delay: int = 33, seed: int | None = None):
+        TurtleAdventure.__init__(self, screen_width, screen_height, level, seed)
+        self.outcome: int = 0
+        self.__canvas: HeadlessCanvas = HeadlessCanvas()
+        GameLoop.__init__(self, update_delay)
+        self.init_game()
+        self.start()
+
+    @property
+    def canvas(self) -> HeadlessCanvas:
+        """
+        Get the headless canvas of the game
+        """
+        return self.__canvas
+
+    def create_player(self) -> HeadlessPlayer:
+        return HeadlessPlayer(self)
+
+    def load_image(self, filename: str, index: int | None = None) -> None:
+        # images are never loaded without a display
+        return None
+
+    def reset(self) -> None:
+        """
+        Restart the game from the beginning
+        """
+        super().reset()
+        self.outcome = 0
+        self.start()
+
+    def restore(self, snapshot: GameSnapshot) -> None:
+        """
+        Return to a captured state, clearing the result of a finished game
+        """
+        super().restore(snapshot)
+        self.outcome = 0
+        self.start()
+
+    def game_over_win(self) -> None:
+        """
+        Record the win and stop the game
+        """
+        if self.is_started:
+            self.outcome = 1
+        self.stop()
+
+    def game_over_lose(self) -> None:
+        """
+        Record the loss and stop the game
+        """
+        if self.is_started:
+            self.outcome = -1
+        self.stop()
+
+
+class _EnvBatch:
+    """
+    A group of headless games stepped together in one process.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, num_envs: int, level: int, screen_width: int,
+                 screen_height: int, max_enemies: int, max_steps: int,
+                 first_env: int = 0):
+        self.__num_envs: int = num_envs
+        self.__first_env: int = first_env
+        self.__level: int = level
+        self.__size: tuple[int, int] = (screen_width, screen_height)
+        self.__max_enemies: int = max_enemies
+        self.__max_steps: int = max_steps
+        self.__games: list[HeadlessTurtleAdventureGame] = []
+        self.__steps: np.ndarray = np.zeros(num_envs, dtype=np.int64)
+        # each environment draws the seeds of its games from its own
+        # generator, so they do not depend on how environments are grouped
+        self.__seeds: list[random.Random] = [random.Random() for _ in range(num_envs)]
+
+    def __new_game(self, index: int) -> HeadlessTurtleAdventureGame:
+        return HeadlessTurtleAdventureGame(*self.__size, level=self.__level,
+                                           seed=self.__seeds[index].getrandbits(64))
+
+    def reset(self, seed: int | None = None) -> dict[str, np.ndarray]:
+        """
+        Start a new game in every environment
+        """
+        if seed is not None:
+            for i, seeds in enumerate(self.__seeds):
+                seeds.seed(f"{seed}/{self.__first_env + i}")
+        self.__games = [self.__new_game(i) for i in range(self.__num_envs)]
+        self.__steps[:] = 0
+        return self.observe()
+
+    def step(self, actions: np.ndarray):
+        """
+        Move every waypoint to its target, advance every game by one frame
+        and start a new game wherever one has ended
+        """
+        rewards = np.zeros(self.__num_envs, dtype=np.float32)
+        dones = np.zeros(self.__num_envs, dtype=bool)
+        infos: list[dict[str, Any]] = [{} for _ in range(self.__num_envs)]
+        for i, game in enumerate(self.__games):
+            target_x, target_y = actions[i]
+            if not (math.isnan(target_x) or math.isnan(target_y)):
+                game.waypoint.activate(float(target_x), float(target_y))
+            if game.is_started:
+                game.tick()
+        self.__steps += 1
+        for i, game in enumerate(self.__games):
+            truncated = self.__steps[i] >= self.__max_steps
+            if game.is_started and not truncated:
+                continue
+            rewards[i] = game.outcome
+            dones[i] = True
+            final = self.__observe([game])
+            infos[i] = {"outcome": game.outcome, "truncated": bool(truncated and game.is_started),
+                        "steps": int(self.__steps[i]),
+                        "final_observation": {key: row[0] for key, row in final.items()}}
+            self.__games[i] = self.__new_game(i)
+            self.__steps[i] = 0
+        return self.observe(), rewards, dones, infos
+
+    def observe(self) -> dict[str, np.ndarray]:
+        """
+        Collect the positions of the player, home and enemies of every game
+        """
+        return self.__observe(self.__games)
+
+    def __observe(self, games: list[HeadlessTurtleAdventureGame]) -> dict[str, np.ndarray]:
+        num_envs = len(games)
+        obs = {
+            "player": np.empty((num_envs, 2), dtype=np.float32),
+            "home": np.empty((num_envs, 2), dtype=np.float32),
+            "enemies": np.zeros((num_envs, self.__max_enemies, 2), dtype=np.float32),
+            "enemy_mask": np.zeros((num_envs, self.__max_enemies), dtype=bool),
+        }
+        for i, game in enumerate(games):
+            obs["player"][i] = game.player.x, game.player.y
+            obs["home"][i] = game.home.x, game.home.y
+            enemies = game.enemies[:self.__max_enemies]
+            if enemies:
+                obs["enemies"][i, :len(enemies)] = [(e.x, e.y) for e in enemies]
+                obs["enemy_mask"][i, :len(enemies)] = [e.is_active for e in enemies]
+        return obs
+
+
+def _worker(conn, batch_args: tuple) -> None:
+    """
+    Serve reset/step requests for one _EnvBatch in a subprocess
+    """
+    batch = _EnvBatch(*batch_args)
+    while True:
+        command, data = conn.recv()
+        if command == "reset":
+            conn.send(batch.reset(data))
+        elif command == "step":
+            conn.send(batch.step(data))
+        else:
+            conn.close()
+            return
+
+
+class TurtleAdventureVecEnv:
+    """
+    Host num_envs independent Turtle's Adventure games behind a Gym-style
+    vectorized reset()/step() interface.
+
+    Actions are an array of shape (num_envs, 2) holding the waypoint target
+    of each game; a row of NaN leaves that game's waypoint unchanged.
+    Observations are a dict of arrays: "player" and "home" (num_envs, 2),
+    "enemies" (num_envs, max_enemies, 2) and "enemy_mask"
+    (num_envs, max_enemies).  The reward is 1 for a win, -1 for a loss and 0
+    otherwise.  A game that ends is immediately replaced by a new one; the
+    last observation of the finished game is in the "final_observation"
+    entry of its info dict, with the same keys as the observations but
+    without the environment axis.
+
+    With backend="subprocess" the games are split over num_workers
+    processes.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, num_envs: int, level: int = 1,
+                 screen_width: int = 800, screen_height: int = 500,
+                 max_enemies: int = 64, max_steps: int = 3000,
+                 backend: str = "serial", num_workers: int | None = None):
+        if backend not in ("serial", "subprocess"):
+            raise ValueError(f"unknown backend {backend!r}")
+        self.num_envs: int = num_envs
+        self.__batch: _EnvBatch | None = None
+        self.__conns: list = []
+        self.__procs: list = []
+        if backend == "serial":
+            self.__batch = _EnvBatch(num_envs, level, screen_width, screen_height,
+                                     max_enemies, max_steps)
+            return
+        num_workers = min(num_envs, num_workers or mp.cpu_count())
+        self.__chunks: list[int] = [len(c) for c in
+                                    np.array_split(np.arange(num_envs), num_workers)]
+        first_env = 0
+        for size in self.__chunks:
+            parent_conn, child_conn = mp.Pipe()
+            proc = mp.Process(target=_worker, daemon=True,
+                              args=(child_conn, (size, level, screen_width, screen_height,
+                                                 max_enemies, max_steps, first_env)))
+            first_env += size
+            proc.start()
+            child_conn.close()
+            self.__conns.append(parent_conn)
+            self.__procs.append(proc)
+
+    def reset(self, seed: int | None = None) -> dict[str, np.ndarray]:
+        """
+        Start a new game in every environment and return the observations
+        """
+        if self.__batch is not None:
+            return self.__batch.reset(seed)
+        for conn in self.__conns:
+            conn.send(("reset", seed))
+        return self.__merge([conn.recv() for conn in self.__conns])
+
+    def step(self, actions):
+        """
+        Advance every game by one frame and return (observations, rewards,
+        dones, infos)
+        """
+        actions = np.asarray(actions, dtype=np.float64).reshape(self.num_envs, 2)
+        if self.__batch is not None:
+            return self.__batch.step(actions)
+        start = 0
+        for conn, size in zip(self.__conns, self.__chunks):
+            conn.send(("step", actions[start:start+size]))
+            start += size
+        results = [conn.recv() for conn in self.__conns]
+        return (self.__merge([r[0] for r in results]),
+                np.concatenate([r[1] for r in results]),
+                np.concatenate([r[2] for r in results]),
+                [info for r in results for info in r[3]])
+
+    def close(self) -> None:
+        """
+        Shut down the worker processes, if any
+        """
+        for conn in self.__conns:
+            conn.send(("close", None))
+        for proc in self.__procs:
+            proc.join()
+        self.__conns, self.__procs = [], []
+
+    @staticmethod
+    def __merge(parts: list[dict[str, np.ndarray]]) -> dict[str, np.ndarray]:
+        return {key: np.concatenate([part[key] for part in parts]) for key in parts[0]}